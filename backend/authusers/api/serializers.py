@@ -1,12 +1,17 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils.crypto import constant_time_compare
 from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError as DjangoValidationError
+from backend.serializers import CachedFieldsSerializerMixin
 
 # Default is authusers model
 User = get_user_model()
 
 # Base serializer - log in
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """User serializer for viewing and updating data (except password)."""
     class Meta:
         model = User
@@ -27,15 +32,15 @@ class UserSerializer(serializers.ModelSerializer):
         }
 
     def validate_email(self, value):
-        # Clean the input
-        value = value.strip()
+        # Emails are stored lowercase (DRF already trimmed whitespace)
+        value = value.lower()
         
         # Email is immutable - prevent changes
         if self.instance and value != self.instance.email:
             raise serializers.ValidationError("Email cannot be changed once set.")
         
-        # Check uniqueness (case-insensitive)
-        qs = User.objects.filter(email__iexact=value)
+        # Check uniqueness against the normalized column (uses the unique index)
+        qs = User.objects.filter(email=value)
 
         # If updating an existing instance (Django's ORM)
         if self.instance:
@@ -50,9 +55,9 @@ class UserSerializer(serializers.ModelSerializer):
 
     def validate_username(self, value):
         
-        value = value.strip()
+        value = value.lower()
 
-        qs = User.objects.filter(username__iexact=value)
+        qs = User.objects.filter(username=value)
 
         if self.instance:
             qs = qs.exclude(pk=self.instance.pk)
@@ -68,11 +73,12 @@ class UserSerializer(serializers.ModelSerializer):
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
 
-        instance.save()
+        # Only write the columns that changed (never the password hash)
+        instance.save(update_fields=list(validated_data))
         return instance
 
 # For creation stage - sign up state
-class UserCreationSerializer(serializers.ModelSerializer):
+class UserCreationSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """Serializer for creating new users."""
     password = serializers.CharField(write_only=True, required=True, allow_blank=False)
     password_confirm = serializers.CharField(write_only=True, required=True)
@@ -81,34 +87,56 @@ class UserCreationSerializer(serializers.ModelSerializer):
         model = User
         fields = ["username", "email", "password", "password_confirm", "first_name", "last_name", "phone"]
         extra_kwargs = {
-            "username": {"required": True},
-            "email": {"required": True},
+            # Uniqueness is checked with a single query in validate()
+            "username": {"required": True, "validators": []},
+            "email": {"required": True, "validators": []},
         }
 
     def validate(self, attrs):
         if attrs['password'] != attrs['password_confirm']:
             raise serializers.ValidationError({"password": "Passwords don't match."})
         attrs.pop('password_confirm')
+
+        # Check email and username uniqueness in one round-trip
+        existing = User.objects.filter(
+            Q(email=attrs["email"]) | Q(username=attrs["username"])
+        ).values_list("email", "username")
+
+        errors = {}
+        for email, username in existing:
+            if email == attrs["email"]:
+                errors["email"] = "Email already in use."
+            if username == attrs["username"]:
+                errors["username"] = "Username already in use."
+
+        if errors:
+            raise serializers.ValidationError(errors)
+
         return attrs
 
     def validate_email(self, value):
-        value = value.strip()
-        if User.objects.filter(email__iexact=value).exists():
-            raise serializers.ValidationError("Email already in use.")
-        return value
+        # Emails are stored lowercase (DRF already trimmed whitespace)
+        return value.lower()
     
     def validate_username(self, value):
-        
-        value = value.strip()
-
-        # Ensure uniqueness of username
-        if User.objects.filter(username__iexact=value).exists():
-            raise serializers.ValidationError("Username already in use.")
-        
-        return value
+        # Usernames are stored lowercase (DRF already trimmed whitespace)
+        return value.lower()
     
     def create(self, validated_data): 
-        return User.objects.create_user(**validated_data)
+        password = validated_data.pop("password")
+        user = User(**validated_data)
+
+        # Hash first - the slow step stays outside the insert
+        user.set_password(password)
+
+        try:
+            with transaction.atomic():
+                user.save()
+        except IntegrityError:
+            # A concurrent signup claimed the email or username after validate()
+            raise serializers.ValidationError("Email or username already in use.")
+
+        return user
 
     
 # Change password - log in state
@@ -119,22 +147,22 @@ class ChangePasswordSerializer(serializers.Serializer):
     new_password_confirm = serializers.CharField(write_only=True, required=True)
     
     def validate_current_password(self, value):
-        user = getattr(self, "instance", None) or self.context.get("request", None).user
-        if not user or not user.check_password(value):
+        user = self.context["request"].user
+        if not user.check_password(value):
             raise serializers.ValidationError("Current password is incorrect.")
         
         return value
     
-    def validate_new_password(self, value):
-        # Use built-in password validator
-        validate_password(value)
-        return value
-    
     def validate(self, attrs):
-        if attrs['new_password'] != attrs['new_password_confirm']:
+        if not constant_time_compare(attrs['new_password'], attrs['new_password_confirm']):
             raise serializers.ValidationError({"new_password": "Passwords don't match."})
         
-        validate_password(attrs["new_password"], user=self.instance)
+        # Use built-in password validators once, with the user for the similarity check
+        try:
+            validate_password(attrs["new_password"], user=self.context["request"].user)
+        except DjangoValidationError as e:
+            raise serializers.ValidationError({"new_password": list(e.messages)})
+
         return attrs
     
     def save(self):
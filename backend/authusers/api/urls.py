@@ -1,4 +1,5 @@
 from django.urls import path
+from rest_framework.routers import SimpleRouter
 from .views import CreateUserView, UpdatePasswordView, UpdateRetrieveUserInfoView
 from orders.api.views import CustomerOrderViewSet
 
@@ -9,33 +10,16 @@ auth_urlpatterns = [
     path("me/password/", UpdatePasswordView.as_view(), name="update-password")
 ]
 
-# Manual URL patterns for customer orders management
-order_urlpatterns = [
-    # List and create orders
-    path(
-        "<str:username>/orders/",
-        CustomerOrderViewSet.as_view({"get": "list", "post": "create"}),
-        name="user-orders-list"
-    ),
-    # Order statistics
-    path(
-        "<str:username>/orders/statistics/",
-        CustomerOrderViewSet.as_view({"get": "statistics"}),
-        name="user-orders-statistics"
-    ),
-    # Order detail
-    path(
-        "<str:username>/orders/<int:pk>/",
-        CustomerOrderViewSet.as_view({"get": "retrieve"}),
-        name="user-orders-detail"
-    ),
-    # Cancel order
-    path(
-        "<str:username>/orders/<int:pk>/cancel/",
-        CustomerOrderViewSet.as_view({"post": "cancel"}),
-        name="user-orders-cancel"
-    ),
-]
+# Router for customer orders management
+# Emits user-orders-list, user-orders-statistics, user-orders-detail and user-orders-cancel
+# The username segment takes anything up to the next slash; the view looks the
+# user up, so usernames outside Django's default charset (e.g. with spaces) still resolve
+users_orders_router = SimpleRouter()
+users_orders_router.register(
+    r"(?P<username>[^/]+)/orders",
+    CustomerOrderViewSet,
+    basename="user-orders"
+)
 
 # Combine all URL patterns
-urlpatterns = auth_urlpatterns + order_urlpatterns
\ No newline at end of file
+urlpatterns = auth_urlpatterns + users_orders_router.urls
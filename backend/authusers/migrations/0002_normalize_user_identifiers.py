@@ -0,0 +1,59 @@
+# Generated by Django 5.2.7 on 2026-10-15 11:52
+
+import authusers.models
+from django.db import migrations
+
+
+def lowercase_identifiers(apps, schema_editor):
+    """Lowercase stored emails and usernames.
+
+    Rows whose lowercase form is already taken by another account are left
+    untouched; those duplicates have to be merged by hand.
+    """
+    User = apps.get_model("authusers", "User")
+    taken_emails = set()
+    taken_usernames = set()
+    users = list(User.objects.order_by("pk"))
+
+    for user in users:
+        taken_emails.add(user.email)
+        if user.username:
+            taken_usernames.add(user.username)
+
+    for user in users:
+        update_fields = []
+
+        email = user.email.strip().lower()
+        if email != user.email and email not in taken_emails:
+            taken_emails.discard(user.email)
+            taken_emails.add(email)
+            user.email = email
+            update_fields.append("email")
+
+        if user.username:
+            username = user.username.strip().lower()
+            if username != user.username and username not in taken_usernames:
+                taken_usernames.discard(user.username)
+                taken_usernames.add(username)
+                user.username = username
+                update_fields.append("username")
+
+        if update_fields:
+            user.save(update_fields=update_fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authusers", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name="user",
+            managers=[
+                ("objects", authusers.models.CaseInsensitiveUserManager()),
+            ],
+        ),
+        migrations.RunPython(lowercase_identifiers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-15 12:06
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("authusers", "0002_normalize_user_identifiers"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["username", "phone", "first_name", "last_name"],
+                name="user_search_trgm_idx",
+                opclasses=[
+                    "gin_trgm_ops",
+                    "gin_trgm_ops",
+                    "gin_trgm_ops",
+                    "gin_trgm_ops",
+                ],
+            ),
+        ),
+    ]
@@ -1,6 +1,20 @@
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from phonenumber_field.modelfields import PhoneNumberField
+from backend.lookups import TrigramIContains
+
+# Lets the staff search filter with field__trgm_icontains, which the index below serves
+models.CharField.register_lookup(TrigramIContains)
+
+
+class CaseInsensitiveUserManager(UserManager):
+    """User manager that matches the lowercase identifiers stored by User.save()."""
+    def get_by_natural_key(self, username):
+        # Login lookups hit the unique index with a plain equality
+        return super().get_by_natural_key(username.strip().lower())
+
+
 class User(AbstractUser):
     """
     Columns: username, is_staff=False, is_superuser=False, date_joined,
@@ -14,10 +28,29 @@ class User(AbstractUser):
     # Login with email
     USERNAME_FIELD = "email" 
     REQUIRED_FIELDS = ["username"]
+
+    objects = CaseInsensitiveUserManager()
     
     class Meta:
         verbose_name = 'User'
         verbose_name_plural = 'Users'
+        indexes = [
+            # Trigram index so the staff order search (trgm_icontains, i.e. ILIKE
+            # on the bare columns) avoids a seq scan; icontains cannot use it
+            GinIndex(
+                name="user_search_trgm_idx",
+                fields=["username", "phone", "first_name", "last_name"],
+                opclasses=["gin_trgm_ops"] * 4,
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        """Store email and username lowercase so uniqueness checks use plain equality"""
+        if self.email:
+            self.email = self.email.strip().lower()
+        if self.username:
+            self.username = self.username.strip().lower()
+        super().save(*args, **kwargs)
 
     def __str__(self):
         """Return user's full name or email prefix."""
@@ -0,0 +1,33 @@
+from copy import copy, deepcopy
+from rest_framework import serializers
+
+# Constructed field maps, keyed by serializer class
+_FIELD_CACHE = {}
+
+# Fields that hold a child field bound to themselves (HStoreField is a DictField)
+_NESTED_FIELD_TYPES = (
+    serializers.BaseSerializer,
+    serializers.ManyRelatedField,
+    serializers.ListField,
+    serializers.DictField,
+)
+
+
+class CachedFieldsSerializerMixin:
+    """Build the serializer fields once per class instead of once per instance.
+
+    ModelSerializer.get_fields() introspects the model and Meta on every
+    instantiation. The unbound fields are cached here and each instance
+    receives its own copies, which are then bound as usual.
+    """
+    def get_fields(self):
+        cls = self.__class__
+        if cls not in _FIELD_CACHE:
+            _FIELD_CACHE[cls] = super().get_fields()
+
+        # Nested serializers, many=True relations and List/DictFields bind child
+        # fields of their own, so rebuild those per instance (Field.__deepcopy__)
+        return {
+            name: deepcopy(field) if isinstance(field, _NESTED_FIELD_TYPES) else copy(field)
+            for name, field in _FIELD_CACHE[cls].items()
+        }
@@ -1,11 +1,14 @@
+from django.core.files.storage import default_storage
 from rest_framework import serializers
+from backend.serializers import CachedFieldsSerializerMixin
 from ..models import  Allergen, MenuCategory, MenuItem
 
 
-class MenuItemSerializer(serializers.ModelSerializer):
+class MenuItemSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """Serializer for menu items"""
 
-    category_id = serializers.IntegerField(read_only=True) 
+    # Read the FK column directly, no coercion or related lookup
+    category_id = serializers.ReadOnlyField()
 
     # Read with names
     category_name = serializers.CharField(
@@ -33,17 +36,24 @@ class MenuItemSerializer(serializers.ModelSerializer):
         read_only_fields = ["id"]
     
 
-class MenuItemPublicSerializer(serializers.ModelSerializer):
-    """Public serializer for menu items - read-only"""
-    category_name = serializers.CharField(source="category.name", read_only=True)
-    allergens = serializers.SlugRelatedField(
-        many=True,
-        read_only=True,
-        slug_field="name"
-    )
+def serialize_menu_item(row, allergens, request=None):
+    """Public representation of a menu item built from a values() row - read-only
     
-    class Meta:
-        model = MenuItem
-        fields = ["id", "name", "category_name", "price", "description", "image", 
-                  "is_available", "allergens"]
-        read_only_fields = ["id"]
\ No newline at end of file
+    Produces the same payload the public menu has always returned.
+    """
+    image = row["image"]
+    if image:
+        image = default_storage.url(image)
+        if request is not None:
+            image = request.build_absolute_uri(image)
+
+    return {
+        "id": row["id"],
+        "name": row["name"],
+        "category_name": row["category__name"],
+        "price": f"{row['price']:.2f}",
+        "description": row["description"],
+        "image": image or None,
+        "is_available": row["is_available"],
+        "allergens": allergens,
+    }
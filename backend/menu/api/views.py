@@ -1,7 +1,17 @@
+from django.core.cache import cache
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from rest_framework.permissions import BasePermission, AllowAny
 from rest_framework import viewsets, generics
-from .serializers import MenuItemSerializer, MenuItemPublicSerializer
-from ..models import MenuItem
+from rest_framework.response import Response
+from .serializers import MenuItemSerializer, serialize_menu_item
+from ..models import ItemAllergen, MenuItem, MENU_CACHE_SECONDS, get_menu_version
+
+
+def menu_etag(request, *args, **kwargs):
+    """ETag for the public menu - changes whenever the menu does"""
+    return get_menu_version()
+
     
 class IsSuperUserOrAdmin(BasePermission):
     """Permission for super user and admin user"""
@@ -15,8 +25,45 @@ class MenuItemView(viewsets.ModelViewSet):
     permission_classes = [IsSuperUserOrAdmin]
     ordering = ["name"]
 
+@method_decorator(condition(etag_func=menu_etag), name="get")
 class MenuItemPublicView(generics.ListAPIView):
-    """Public API for customers to browse available menu items"""
-    queryset = MenuItem.objects.all().select_related("category").prefetch_related("allergens")
+    """Public API for customers to browse available menu items
+    
+    The payload is cached per menu version and served with an ETag, so
+    clients holding the current version get a 304 without a body.
+    """
+    # Read-only listing: fetch plain rows instead of hydrating model instances
+    queryset = MenuItem.objects.values(
+        "id", "name", "price", "description", "image", "is_available", "category__name"
+    )
     permission_classes = [AllowAny]
-    serializer_class = MenuItemPublicSerializer
\ No newline at end of file
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        if self.paginator is None:
+            # Image URLs are absolute, so the cached payload is per host
+            key = f"public_menu:{get_menu_version()}:{request.build_absolute_uri('/')}"
+            data = cache.get(key)
+            if data is None:
+                data = self.serialize_rows(list(queryset))
+                cache.set(key, data, MENU_CACHE_SECONDS)
+            return Response(data)
+
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response(self.serialize_rows(page))
+
+    def serialize_rows(self, rows):
+        """Map values() rows to the public payload"""
+        # Allergen names for every row in one query
+        allergens = {}
+        pairs = ItemAllergen.objects.filter(
+            item_id__in=[row["id"] for row in rows]
+        ).values_list("item_id", "allergen__name")
+        for item_id, name in pairs:
+            allergens.setdefault(item_id, []).append(name)
+
+        return [
+            serialize_menu_item(row, allergens.get(row["id"], []), self.request)
+            for row in rows
+        ]
@@ -1,4 +1,19 @@
+from uuid import uuid4
+from django.core.cache import cache
 from django.db import models
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+# The public menu is cached under a version token that changes on every edit.
+# The token also expires, which bounds staleness when each process has its own cache.
+MENU_VERSION_KEY = "menu_version"
+MENU_CACHE_SECONDS = 60
+
+
+def get_menu_version():
+    """Return the current menu version token"""
+    return cache.get_or_set(MENU_VERSION_KEY, lambda: uuid4().hex, MENU_CACHE_SECONDS)
+
 
 class MenuCategory(models.Model):
     name = models.CharField(max_length=30, unique=True)
@@ -78,4 +93,18 @@ class ItemAllergen(models.Model):
         verbose_name_plural = "Item Allergens"
 
     def __str__(self):
-        return f"{self.item.name} - {self.allergen.name}"
\ No newline at end of file
+        return f"{self.item.name} - {self.allergen.name}"
+
+
+@receiver(post_save, sender=MenuCategory)
+@receiver(post_delete, sender=MenuCategory)
+@receiver(post_save, sender=Allergen)
+@receiver(post_delete, sender=Allergen)
+@receiver(post_save, sender=MenuItem)
+@receiver(post_delete, sender=MenuItem)
+@receiver(post_save, sender=ItemAllergen)
+@receiver(post_delete, sender=ItemAllergen)
+@receiver(m2m_changed, sender=ItemAllergen)
+def bump_menu_version(sender, **kwargs):
+    """Invalidate the cached public menu whenever menu data changes"""
+    cache.set(MENU_VERSION_KEY, uuid4().hex, MENU_CACHE_SECONDS)
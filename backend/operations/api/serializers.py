@@ -1,10 +1,9 @@
 from rest_framework import serializers
-from django.utils import timezone
-from datetime import datetime, timedelta
-from ..models import RestaurantSetting
+from backend.serializers import CachedFieldsSerializerMixin
+from ..models import RestaurantSetting, compute_last_call
 
 
-class RestaurantSettingSerializer(serializers.ModelSerializer):
+class RestaurantSettingSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """Serializer for restaurant settings"""
     min_ready_minutes = serializers.IntegerField(min_value=0)
     max_ready_minutes = serializers.IntegerField(min_value=0)
@@ -18,27 +17,16 @@ class RestaurantSettingSerializer(serializers.ModelSerializer):
         input_formats=["%H:%M"]
     )
 
-    last_call = serializers.SerializerMethodField()
-    is_open = serializers.SerializerMethodField()
-    is_accepting_orders_now = serializers.SerializerMethodField()
+    # Read straight from the model (DRF calls the methods with no arguments)
+    last_call = serializers.TimeField(format="%H:%M", read_only=True)
+    is_open = serializers.ReadOnlyField(source="is_open_now")
+    is_accepting_orders_now = serializers.ReadOnlyField()
 
     class Meta:
         model = RestaurantSetting
         fields = "__all__"
         read_only_fields = ["id"]
 
-    def get_last_call(self, obj):
-        """Get last call time from model"""
-        return obj.last_call.strftime("%H:%M") if obj.last_call else None
-    
-    def get_is_open(self, obj):
-        """Check if the restaurant is open"""
-        return obj.is_open_now() 
-    
-    def get_is_accepting_orders_now(self, obj):
-        """Check if the restaurant is accepting orders"""
-        return obj.is_accepting_orders_now() if obj.is_accepting_orders_now else None
-
     # Utilize Model + Serializer validation to improve API experience
     def validate(self, attrs):
         """Validate business logic in the serializer level"""
@@ -80,11 +68,7 @@ class RestaurantSettingSerializer(serializers.ModelSerializer):
         if (open_time is not None and 
             close_time is not None and 
             default_ready is not None):
-            today = timezone.localdate()
-            naive_close_datetime = datetime.combine(today, close_time)
-            close_datetime = timezone.make_aware(naive_close_datetime)
-            last_call_datetime = close_datetime - timedelta(minutes=default_ready)
-            if last_call_datetime.time() < open_time:
+            if compute_last_call(close_time, default_ready) < open_time:
                 errors["last_call"] = "Must be between open time and close time"
 
         if errors:
@@ -1,7 +1,9 @@
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.cache import cache_page
 from rest_framework import viewsets
-from rest_framework.response import Response
-from rest_framework.views import APIView
-from rest_framework.permissions import IsAdminUser, AllowAny
+from rest_framework.permissions import IsAdminUser
 from .serializers import RestaurantSettingSerializer
 from ..models import RestaurantSetting
 # Create your views here.
@@ -13,21 +15,23 @@ class RestaurantSettingsView(viewsets.ModelViewSet):
     serializer_class = RestaurantSettingSerializer
     permission_classes = [IsAdminUser]
 
-# APIview is well suited for checking computed status
-class CheckOpenView(APIView):
+# Plain Django view - this public, polled payload needs no DRF auth,
+# content negotiation or renderers. Flags change on minute boundaries,
+# so a short page cache is safe.
+@method_decorator(cache_page(30), name="dispatch")
+class CheckOpenView(View):
     """Public endpoint to display the status of openness and order acceptance."""
-    permission_classes = [AllowAny]
 
     def get(self, request):
-        restaurant_settings = RestaurantSetting.objects.first()
+        restaurant_settings = RestaurantSetting.load(create=False)
         if not restaurant_settings:
-            return Response({
+            return JsonResponse({
                 "is_open": False,
                 "is_accepting_orders": False,
                 "message": "The restaurant is still being built."
             })
         
-        return Response({
+        return JsonResponse({
             "is_open": restaurant_settings.is_open_now(),
             "is_accepting_orders": restaurant_settings.is_accepting_orders_now(),
             "last_call": restaurant_settings.last_call.strftime("%H:%M") if restaurant_settings.last_call else None,
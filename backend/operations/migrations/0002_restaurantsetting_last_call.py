@@ -0,0 +1,34 @@
+# Generated by Django 5.2.7 on 2026-10-15 11:55
+
+import datetime
+from django.db import migrations, models
+
+
+def fill_last_call(apps, schema_editor):
+    """Store the last call for rows saved before the column existed"""
+    RestaurantSetting = apps.get_model("operations", "RestaurantSetting")
+    for setting in RestaurantSetting.objects.all():
+        close_datetime = datetime.datetime.combine(
+            datetime.date(2000, 1, 1), setting.close_time
+        )
+        last_call = close_datetime - datetime.timedelta(
+            minutes=setting.default_ready_minutes
+        )
+        setting.last_call = last_call.time()
+        setting.save(update_fields=["last_call"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("operations", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="restaurantsetting",
+            name="last_call",
+            field=models.TimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(fill_last_call, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,25 @@
-from datetime import time, datetime, timedelta
+from time import monotonic
+from datetime import date, time, datetime, timedelta
 from django.db import models
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 
+# Per-process cache of the settings row: (instance, expires_at)
+# Other processes pick up changes once the TTL runs out
+_SETTING = None
+_SETTING_TTL_SECONDS = 60
+
+
+def compute_last_call(close_time, default_ready_minutes):
+    """Return close time minus the default ready minutes
+    
+    Both are same-day wall clock times, so no timezone is involved.
+    """
+    close_datetime = datetime.combine(date(2000, 1, 1), close_time)
+    return (close_datetime - timedelta(minutes=default_ready_minutes)).time()
+
 # Create your models here.
 class RestaurantSetting(models.Model):
     """Restaurant operational settings
@@ -22,11 +39,25 @@ class RestaurantSetting(models.Model):
     open_time = models.TimeField(default=time(11, 30))
     close_time = models.TimeField(default=time(21, 30))
 
+    # Precomputed in save() so status checks are plain time comparisons
+    last_call = models.TimeField(null=True, editable=False)
+
     @classmethod
-    def load(cls):
-        """Always return the only one object"""
-        obj, _ = cls.objects.get_or_create(pk=1)
-        return obj
+    def load(cls, create=True):
+        """Return the only one object, served from the per-process cache
+
+        Use this instead of querying RestaurantSetting directly.
+        With create=False, return None instead of creating a missing row.
+        """
+        global _SETTING
+        if _SETTING is None or _SETTING[1] <= monotonic():
+            obj = cls.objects.first()
+            if obj is None:
+                if not create:
+                    return None
+                obj, _ = cls.objects.get_or_create(pk=1)
+            _SETTING = (obj, monotonic() + _SETTING_TTL_SECONDS)
+        return _SETTING[0]
     
     class Meta:
         verbose_name = "Restaurant Setting"
@@ -35,6 +66,7 @@ class RestaurantSetting(models.Model):
     def save(self, *args, **kwargs):
         """Only one record exists"""
         self.pk = 1
+        self.last_call = self.calculate_last_call()
         self.full_clean()  
         super().save(*args, **kwargs) 
 
@@ -101,16 +133,18 @@ class RestaurantSetting(models.Model):
         
         All orders must be placed before the last call.
         """
-        today = timezone.localdate()  
-        naive_close_datetime = datetime.combine(today, self.close_time)
-        close_datetime = timezone.make_aware(naive_close_datetime)
-        last_call_datetime = close_datetime - timedelta(minutes=self.default_ready_minutes)
-        return last_call_datetime.time()
-    
-    @property
-    def last_call(self):
-        """Property that returns the calculated last call time"""
-        return self.calculate_last_call()
-    
+        return compute_last_call(self.close_time, self.default_ready_minutes)
+
+
+@receiver(post_save, sender=RestaurantSetting)
+def cache_saved_setting(sender, instance, **kwargs):
+    """Keep the freshly saved settings row as the cached one"""
+    global _SETTING
+    _SETTING = (instance, monotonic() + _SETTING_TTL_SECONDS)
+
 
-          
\ No newline at end of file
+@receiver(post_delete, sender=RestaurantSetting)
+def clear_cached_setting(sender, **kwargs):
+    """Drop the cached settings row once it is deleted"""
+    global _SETTING
+    _SETTING = None
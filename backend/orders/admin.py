@@ -2,4 +2,10 @@ from django.contrib import admin
 from .models import Order, OrderItem
 # Register your models here.
 admin.site.register(Order)
-admin.site.register(OrderItem)
+
+
+@admin.register(OrderItem)
+class OrderItemAdmin(admin.ModelAdmin):
+    def get_queryset(self, request):
+        # __str__ shows the menu item name, so join it up front
+        return OrderItem.display_objects.all()
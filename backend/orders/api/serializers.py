@@ -1,9 +1,26 @@
 from rest_framework import serializers
 from decimal import Decimal
-from ..models import Order, OrderItem
+from django.db import transaction
+from backend.serializers import CachedFieldsSerializerMixin
+from menu.models import MenuItem
+from ..models import Order, OrderItem, VALID_STATUS_TRANSITIONS, compute_promised_ready_time
 
-class OrderItemWriteSerializer(serializers.ModelSerializer):
+# Columns read by serialize_order_row()
+ORDER_ROW_FIELDS = [
+    "id", "status", "total", "item_count", "created_at",
+    "user__first_name", "user__last_name", "user__email", "user__phone",
+]
+_created_at_field = serializers.DateTimeField()
+
+# Rendering of promised_ready_time, shared by the serializers and the row payload
+PROMISED_READY_TIME_FORMAT = "%Y-%m-%d %H:%M"
+_promised_ready_time_field = serializers.DateTimeField(format=PROMISED_READY_TIME_FORMAT)
+
+class OrderItemWriteSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """Serializer for creating order items"""
+    # Menu item ID, resolved against the items OrderCreateSerializer loads up front
+    item = serializers.IntegerField()
+
     class Meta:
         model = OrderItem
         fields = [
@@ -12,15 +29,6 @@ class OrderItemWriteSerializer(serializers.ModelSerializer):
             "unit_price",
             "note"
         ]
-
-    def validate_item(self, value):
-        """Validate item's availability"""
-        # value = entire menu item object, DRF automatically maps it out
-        if not value.is_available:
-            raise serializers.ValidationError(
-                    f"Item '{value.name}' is currently not available"
-                )
-        return value
     
     def validate_quantity(self, value):
         """Validate item's quantity"""
@@ -39,20 +47,37 @@ class OrderItemWriteSerializer(serializers.ModelSerializer):
     def validate(self, attrs):
         """Validate with a cross-field approach """
         # In this case, attrs is dict, not an object
-        menu_item = attrs.get("item")
-        unit_price = attrs.get("unit_price")
+        item_id = attrs["item"]
+        menu_items = self.context.get("menu_items")
+        if menu_items is None:
+            menu_item = MenuItem.objects.filter(pk=item_id).first()
+        else:
+            menu_item = menu_items.get(item_id)
 
-        if menu_item and unit_price:
+        if menu_item is None:
+            raise serializers.ValidationError({
+                "item": f'Invalid pk "{item_id}" - object does not exist.'
+            })
+
+        # Validate item's availability
+        if not menu_item.is_available:
+            raise serializers.ValidationError({
+                "item": f"Item '{menu_item.name}' is currently not available"
+            })
+
+        unit_price = attrs.get("unit_price")
+        if unit_price:
             if unit_price != menu_item.price:
                 raise serializers.ValidationError({
                     'unit_price': f"Price mismatch. Current price is {menu_item.price}. " + 
                     "Please refresh and try again."
                 })
-            
+
+        attrs["item"] = menu_item
         return attrs
     
 
-class OrderItemReadSerializer(serializers.ModelSerializer):
+class OrderItemReadSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """Serializer for reading the order items"""
     item_id = serializers.IntegerField(source='item.id', read_only=True)
     item_name = serializers.CharField(source='item.name', read_only=True)
@@ -70,7 +95,7 @@ class OrderItemReadSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 # ============== Order ==============
-class OrderCreateSerializer(serializers.ModelSerializer):
+class OrderCreateSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """Serializer for creating new orders"""
     items = OrderItemWriteSerializer(many=True)
     
@@ -96,6 +121,23 @@ class OrderCreateSerializer(serializers.ModelSerializer):
             "created_at",
         ]
 
+    def to_internal_value(self, data):
+        """Load every ordered menu item in one query before the items are validated"""
+        items = data.get("items") if hasattr(data, "get") else None
+        item_ids = set()
+        if isinstance(items, list):
+            for order_item in items:
+                try:
+                    item_ids.add(int(order_item["item"]))
+                except (TypeError, KeyError, ValueError):
+                    # Left for the item serializer to report
+                    pass
+
+        self.context["menu_items"] = MenuItem.objects.only(
+            "id", "name", "price", "is_available"
+        ).in_bulk(item_ids)
+        return super().to_internal_value(data)
+
     def validate_items(self, value):
         """Ensure the items of an order must be greater than zero"""
         if not value:
@@ -110,6 +152,7 @@ class OrderCreateSerializer(serializers.ModelSerializer):
         
         return value
     
+    @transaction.atomic
     def create(self, validated_data):
         """Create order with items"""
         items_data = validated_data.pop("items")
@@ -117,27 +160,34 @@ class OrderCreateSerializer(serializers.ModelSerializer):
         # Create the order with the authenticated user
         order = Order.objects.create(
             user=self.context["request"].user,
-            gratuity=validated_data.get("gratuity", Decimal("0.00"))
+            gratuity=validated_data.get("gratuity", Decimal("0.00")),
+            # bulk_create() below skips OrderItem.save(), so set the count here
+            item_count=sum(order_item["quantity"] for order_item in items_data)
         )
 
         # Create the order items with price snapshots from the frontend
+        order_items = []
         for order_item in items_data:
-            OrderItem.objects.create(
+            obj = OrderItem(
                 order=order,
                 item=order_item["item"],
                 quantity=order_item["quantity"],
                 note=order_item.get("note", ""),
                 unit_price=order_item["unit_price"]
             )
-        # Calculate related prices
-        order.calculate_prices()
+            # bulk_create() bypasses OrderItem.save()
+            obj.calculate_item_total()
+            order_items.append(obj)
+
+        # One multi-row INSERT for all items
+        OrderItem.objects.bulk_create(order_items)
 
-        # Store it into related database
-        order.refresh_from_db()
+        # Calculate related prices (updates the in-memory order as well)
+        order.calculate_prices()
 
         return order
 
-class OrderSimpliedSerializer(serializers.ModelSerializer):
+class OrderSimpliedSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """Serializer for simplied view"""
     # This simplified view is for both staff and end users
     user_name = serializers.CharField(source="user", read_only=True)
@@ -145,7 +195,7 @@ class OrderSimpliedSerializer(serializers.ModelSerializer):
     item_count = serializers.IntegerField(read_only=True)
     promised_ready_time = serializers.DateTimeField(
         read_only=True,
-        format="%Y-%m-%d %H:%M"
+        format=PROMISED_READY_TIME_FORMAT
     )
 
     class Meta:
@@ -161,8 +211,31 @@ class OrderSimpliedSerializer(serializers.ModelSerializer):
             "promised_ready_time"
         ]
         read_only_fields = fields
+
+
+def serialize_order_row(row, ready_minutes):
+    """Simplified representation of an order built from a values() row - read-only
+
+    Produces the same payload as OrderSimpliedSerializer.
+    """
+    # Same fallback as User.__str__
+    user_name = f"{row['user__first_name']} {row['user__last_name']}".strip()
+    phone = row["user__phone"]
+    promised = compute_promised_ready_time(row["created_at"], ready_minutes)
+
+    return {
+        "id": row["id"],
+        "user_name": user_name or row["user__email"].split("@")[0],
+        "user_phone": str(phone) if phone is not None else None,
+        "item_count": row["item_count"],
+        "status": row["status"],
+        "total": f"{row['total']:.2f}",
+        "created_at": _created_at_field.to_representation(row["created_at"]),
+        "promised_ready_time": _promised_ready_time_field.to_representation(promised),
+    }
+
     
-class OrderDetailSerializer(serializers.ModelSerializer):
+class OrderDetailSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """Serializer for detail view"""
     items = OrderItemReadSerializer(many=True, read_only=True)
     user_name = serializers.CharField(source="user", read_only=True)
@@ -170,7 +243,7 @@ class OrderDetailSerializer(serializers.ModelSerializer):
     item_count = serializers.IntegerField(read_only=True)
     promised_ready_time = serializers.DateTimeField(
         read_only=True,
-        format="%Y-%m-%d %H:%M"
+        format=PROMISED_READY_TIME_FORMAT
     )
 
     class Meta:
@@ -195,7 +268,7 @@ class OrderDetailSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = fields
             
-class OrderStatusUpdateSerializer(serializers.ModelSerializer):
+class OrderStatusUpdateSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """Serializer for the staff to update the order states
 
     Status includes "Ready", "Complete", "Cancel"
@@ -215,26 +288,14 @@ class OrderStatusUpdateSerializer(serializers.ModelSerializer):
         instance = self.instance
         current_status = instance.status
 
-        # The validated transactions
-        # Pending => Ready or Cancel
-        # Ready => Complete or Cancel
-        # Complete => no further status
-        # Cancel => no further status
-
-        valid_transactions = {
-            Order.Status.PENDING: [Order.Status.READY, Order.Status.CANCELED],
-            Order.Status.READY: [Order.Status.COMPLETE, Order.Status.CANCELED],
-            Order.Status.COMPLETE: [],
-            Order.Status.CANCELED: []
-        }
-
-        if value not in valid_transactions.get(current_status, []):
+        if value not in VALID_STATUS_TRANSITIONS.get(current_status, ()):
             raise serializers.ValidationError(
                 f"Cannot change status from '{current_status}' to '{value}'"
             )
         
         return value
     
+    @transaction.atomic
     def update(self, instance, validated_data):
         """Update status with order model methods"""
 
@@ -266,6 +327,7 @@ class OrderCanceledByCustomerSerializer(serializers.Serializer):
         
         return value.strip()
     
+    @transaction.atomic
     def save(self):
         """Cancel order by customer"""
         order = self.context["order"]
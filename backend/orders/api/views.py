@@ -1,8 +1,12 @@
+from datetime import date, datetime, time, timedelta
 from django.shortcuts import get_object_or_404
-from django.db.models import Count, Q
+from django.db import transaction
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Prefetch, Q, Sum
 from django.utils import timezone
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 
@@ -11,13 +15,62 @@ from .serializers import (
     OrderSimpliedSerializer, 
     OrderDetailSerializer,
     OrderStatusUpdateSerializer,
-    OrderCanceledByCustomerSerializer
+    OrderCanceledByCustomerSerializer,
+    ORDER_ROW_FIELDS,
+    serialize_order_row,
 )
-from ..models import Order
+from ..models import Order, OrderItem
+from operations.models import RestaurantSetting
+
+User = get_user_model()
 
 # Create your views here.
 
-class CustomerOrderViewSet(viewsets.ModelViewSet):
+def order_items_prefetch():
+    """Prefetch order items with only the columns OrderItemReadSerializer renders"""
+    return Prefetch(
+        "items",
+        queryset=OrderItem.objects.select_related("item").only(
+            "id", "order", "quantity", "note", "unit_price", "item_total", "item__name"
+        )
+    )
+
+
+class LockedObjectMixin:
+    """Viewset mixin for actions that must update an order under a row lock"""
+
+    def get_locked_object(self):
+        """Like get_object(), but locks the order row until the transaction ends"""
+        queryset = self.get_queryset().select_for_update(of=("self",))
+        obj = get_object_or_404(queryset, pk=self.kwargs["pk"])
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+
+def day_start(day):
+    """Local midnight at the start of the given date, as an aware datetime"""
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def created_through(day):
+    """Filter for orders created on or before the given local date
+
+    Half-open created_at ranges can use the plain index on created_at,
+    unlike the created_at::date cast behind __date lookups. date.max has
+    no next midnight, so it leaves the range open-ended.
+    """
+    if day == date.max:
+        return Q()
+    return Q(created_at__lt=day_start(day + timedelta(days=1)))
+
+
+def serialize_order_rows(rows):
+    """Map values() rows to the simplified order payload"""
+    ready_minutes = RestaurantSetting.load().default_ready_minutes
+    return [serialize_order_row(row, ready_minutes) for row in rows]
+
+
+class CustomerOrderViewSet(LockedObjectMixin, viewsets.ModelViewSet):
     """
     Viewset for users to manage orders
 681
@@ -30,22 +83,30 @@ class CustomerOrderViewSet(viewsets.ModelViewSet):
     """
 
     permission_classes = [IsAuthenticated]
-    lookup_field = "username"
+    # Customers can only create, read and cancel orders
+    http_method_names = ["get", "post", "head", "options"]
+    lookup_value_regex = "[0-9]+"
 
     def get_user(self):
-        """Get user from URL parameter"""
-        from django.contrib.auth import get_user_model
-        User = get_user_model()
-        username = self.kwargs.get("username")
-        return get_object_or_404(User, username=username)
+        """Get user from URL parameter, looked up once per request"""
+        if not hasattr(self, "_cached_user"):
+            # Usernames are stored lowercase
+            username = self.kwargs.get("username", "").lower()
+            self._cached_user = get_object_or_404(
+                User.objects.only("id", "username", "email", "phone", "first_name", "last_name"),
+                username=username
+            )
+        return self._cached_user
 
     def get_queryset(self):
         """Return orders for the specific user from URL"""
         user = self.get_user()
         # Query to look up user's past orders
-        queryset = Order.objects.filter(user=user).annotate(
-            item_count=Count("items")
-        ).select_related("user").prefetch_related("items__item")
+        queryset = Order.objects.filter(user=user).select_related("user")
+
+        # Only the detail responses render the order items
+        if self.action != "list":
+            queryset = queryset.prefetch_related(order_items_prefetch())
 
         return queryset.order_by("-created_at")
     
@@ -59,7 +120,7 @@ class CustomerOrderViewSet(viewsets.ModelViewSet):
             return OrderCanceledByCustomerSerializer
         else:
             return OrderSimpliedSerializer
-        
+
     def create(self, request, *args, **kwargs):
         user = self.get_user()
 
@@ -70,7 +131,7 @@ class CustomerOrderViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        serializer = self.get_serializer_class(data=request.data)
+        serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         order = serializer.save()
 
@@ -82,7 +143,10 @@ class CustomerOrderViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Return detailed order information
+        # Return detailed order information, loading items and user up front
+        order = Order.objects.select_related("user").prefetch_related(
+            order_items_prefetch()
+        ).get(pk=order.pk)
         detail_serializer = OrderDetailSerializer(order)
 
         return Response(
@@ -94,8 +158,8 @@ class CustomerOrderViewSet(viewsets.ModelViewSet):
         """List orders for the specific user"""
 
         queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        # Plain rows skip the per-order serializer field walk
+        return Response(serialize_order_rows(queryset.values(*ORDER_ROW_FIELDS)))
 
     def retrieve(self, request, *args, **kwargs):
         """Get detailed order information"""
@@ -119,19 +183,22 @@ class CustomerOrderViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        queryset = Order.objects.filter(user=user)
-
+        # Count every status in a single grouped query
+        counts = dict(
+            Order.objects.filter(user=user).order_by().values_list('status').annotate(c=Count('id'))
+        )
         stats = {
-            'total': queryset.count(),
-            'pending': queryset.filter(status=Order.Status.PENDING).count(),
-            'ready': queryset.filter(status=Order.Status.READY).count(),
-            'complete': queryset.filter(status=Order.Status.COMPLETE).count(),
-            'canceled': queryset.filter(status=Order.Status.CANCELED).count(),
+            'total': sum(counts.values()),
+            'pending': counts.get(Order.Status.PENDING, 0),
+            'ready': counts.get(Order.Status.READY, 0),
+            'complete': counts.get(Order.Status.COMPLETE, 0),
+            'canceled': counts.get(Order.Status.CANCELED, 0),
         }
         
         return Response(stats)
     
     @action(detail=True, methods=['post'])
+    @transaction.atomic
     def cancel(self, request, *args, **kwargs):
         """
         Cancel order by customer
@@ -139,7 +206,7 @@ class CustomerOrderViewSet(viewsets.ModelViewSet):
         Required field:
         - cancel_reason: Reason for cancellation
         """
-        instance = self.get_object()
+        instance = self.get_locked_object()
         user = self.get_user()
         
         # Ensure order belongs to the user in the URL
@@ -168,12 +235,18 @@ class CustomerOrderViewSet(viewsets.ModelViewSet):
         return Response(detail_serializer.data)
     
 
-class StaffOrderViewSet(viewsets.ModelViewSet):
+class StaffOrderPagination(CursorPagination):
+    """Keyset pages over the newest orders, cheap at any depth"""
+    page_size = 50
+    ordering = "-created_at"
+
+
+class StaffOrderViewSet(LockedObjectMixin, viewsets.ModelViewSet):
     """
     ViewSet for staff order management
     
     Staff endpoints:
-    - GET /staff/orders/ - List all orders (with filters)
+    - GET /staff/orders/ - List all orders (with filters, 50 per page)
     - GET /staff/orders/{id}/ - Get order detail
     - PATCH /staff/orders/{id}/ - Update order status (direct update)
     - PATCH /staff/orders/{id}/update-status/ - Update order status (custom action)
@@ -181,14 +254,17 @@ class StaffOrderViewSet(viewsets.ModelViewSet):
     """
     permission_classes = [IsAdminUser]
     http_method_names = ['get', 'patch', 'head', 'options']  # Only allow GET and PATCH
+    pagination_class = StaffOrderPagination
     
     def get_queryset(self):
         """
-        Return all orders with annotations
+        Return all orders with their users
         """
-        queryset = Order.objects.all().annotate(
-            item_count=Count('items')
-        ).select_related('user').prefetch_related('items__item')
+        queryset = Order.objects.all().select_related('user')
+
+        # Only the detail responses render the order items
+        if self.action != 'list':
+            queryset = queryset.prefetch_related(order_items_prefetch())
         
         return queryset.order_by('-created_at')
     
@@ -200,7 +276,7 @@ class StaffOrderViewSet(viewsets.ModelViewSet):
             return OrderStatusUpdateSerializer
         else:
             return OrderSimpliedSerializer
-    
+
     def list(self, request, *args, **kwargs):
         """
         List all orders with filtering options
@@ -224,37 +300,37 @@ class StaffOrderViewSet(viewsets.ModelViewSet):
         
         if date_from:
             try:
-                date_from_obj = timezone.datetime.strptime(date_from, '%Y-%m-%d')
-                queryset = queryset.filter(created_at__gte=date_from_obj)
+                queryset = queryset.filter(created_at__gte=day_start(date.fromisoformat(date_from)))
             except ValueError:
                 pass
         
         if date_to:
             try:
-                date_to_obj = timezone.datetime.strptime(date_to, '%Y-%m-%d')
-                # Include the entire day
-                date_to_obj = date_to_obj.replace(hour=23, minute=59, second=59)
-                queryset = queryset.filter(created_at__lte=date_to_obj)
+                # Up to the start of the next day, so the entire day is included
+                queryset = queryset.filter(created_through(date.fromisoformat(date_to)))
             except ValueError:
                 pass
         
         # Search filter (user name or phone)
         search = request.query_params.get('search', None)
         if search:
-            queryset = queryset.filter(
-                Q(user__username__icontains=search) |
-                Q(user__phone__icontains=search) |
-                Q(user__first_name__icontains=search) |
-                Q(user__last_name__icontains=search)
-            )
-        
+            # Match users once, then join orders on the user primary key;
+            # trgm_icontains is ILIKE on the bare columns, served by user_search_trgm_idx
+            matching_users = User.objects.filter(
+                Q(username__trgm_icontains=search) |
+                Q(phone__trgm_icontains=search) |
+                Q(first_name__trgm_icontains=search) |
+                Q(last_name__trgm_icontains=search)
+            ).values('pk')
+            queryset = queryset.filter(user__in=matching_users)
+        
+        # Plain rows skip the per-order serializer field walk
+        queryset = queryset.values(*ORDER_ROW_FIELDS)
         page = self.paginate_queryset(queryset)
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+            return self.get_paginated_response(serialize_order_rows(page))
         
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return Response(serialize_order_rows(queryset))
     
     def retrieve(self, request, *args, **kwargs):
         """
@@ -265,6 +341,7 @@ class StaffOrderViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
     
     @action(detail=True, methods=['patch'], url_path='update-status')
+    @transaction.atomic
     def update_status(self, request, pk=None):
         """
         Update order status
@@ -273,7 +350,8 @@ class StaffOrderViewSet(viewsets.ModelViewSet):
         - PENDING -> READY or CANCELED
         - READY -> COMPLETE or CANCELED
         """
-        instance = self.get_object()
+        # Lock the row so concurrent status changes apply one at a time
+        instance = self.get_locked_object()
         
         # Get cancel reason if status is being changed to canceled
         cancel_reason = request.data.get('cancel_reason', 'Canceled by staff')
@@ -309,10 +387,8 @@ class StaffOrderViewSet(viewsets.ModelViewSet):
         - /staff/orders/statistics/?period=week → Last 7 days
         - /staff/orders/statistics/?date_from=2024-11-01&date_to=2024-11-30 → Custom range
         """
-        from datetime import timedelta
-        
         queryset = Order.objects.all()
-        today = timezone.now().date()
+        today = timezone.localdate()
         
         # Handle predefined periods
         period = request.query_params.get('period', None)
@@ -339,8 +415,8 @@ class StaffOrderViewSet(viewsets.ModelViewSet):
                 )
             
             queryset = queryset.filter(
-                created_at__date__gte=start_date,
-                created_at__date__lte=end_date
+                created_through(end_date),
+                created_at__gte=day_start(start_date)
             )
             period_label = period
         
@@ -348,8 +424,11 @@ class StaffOrderViewSet(viewsets.ModelViewSet):
         elif request.query_params.get('date'):
             date_str = request.query_params.get('date')
             try:
-                specific_date = timezone.datetime.strptime(date_str, '%Y-%m-%d').date()
-                queryset = queryset.filter(created_at__date=specific_date)
+                specific_date = date.fromisoformat(date_str)
+                queryset = queryset.filter(
+                    created_through(specific_date),
+                    created_at__gte=day_start(specific_date)
+                )
                 start_date = specific_date
                 end_date = specific_date
                 period_label = date_str
@@ -366,14 +445,14 @@ class StaffOrderViewSet(viewsets.ModelViewSet):
             
             try:
                 if date_from:
-                    start_date = timezone.datetime.strptime(date_from, '%Y-%m-%d').date()
-                    queryset = queryset.filter(created_at__date__gte=start_date)
+                    start_date = date.fromisoformat(date_from)
+                    queryset = queryset.filter(created_at__gte=day_start(start_date))
                 else:
                     start_date = None
                 
                 if date_to:
-                    end_date = timezone.datetime.strptime(date_to, '%Y-%m-%d').date()
-                    queryset = queryset.filter(created_at__date__lte=end_date)
+                    end_date = date.fromisoformat(date_to)
+                    queryset = queryset.filter(created_through(end_date))
                 else:
                     end_date = None
                 
@@ -386,31 +465,31 @@ class StaffOrderViewSet(viewsets.ModelViewSet):
         
         # Default to today
         else:
-            queryset = queryset.filter(created_at__date=today)
+            queryset = queryset.filter(created_through(today), created_at__gte=day_start(today))
             start_date = today
             end_date = today
             period_label = 'today'
         
-        # Calculate statistics
+        # Calculate statistics - one grouped row per status with its revenue
+        counts = {}
+        revenue = None
+        grouped = queryset.order_by().values_list('status').annotate(c=Count('id'), r=Sum('total'))
+        for row_status, count, total in grouped:
+            counts[row_status] = count
+            # Revenue only comes from completed orders
+            if row_status == Order.Status.COMPLETE:
+                revenue = total
+
         stats = {
             'period': period_label,
             'start_date': start_date.strftime('%Y-%m-%d') if start_date else None,
             'end_date': end_date.strftime('%Y-%m-%d') if end_date else None,
-            'total': queryset.count(),
-            'pending': queryset.filter(status=Order.Status.PENDING).count(),
-            'ready': queryset.filter(status=Order.Status.READY).count(),
-            'complete': queryset.filter(status=Order.Status.COMPLETE).count(),
-            'canceled': queryset.filter(status=Order.Status.CANCELED).count(),
+            'total': sum(counts.values()),
+            'pending': counts.get(Order.Status.PENDING, 0),
+            'ready': counts.get(Order.Status.READY, 0),
+            'complete': counts.get(Order.Status.COMPLETE, 0),
+            'canceled': counts.get(Order.Status.CANCELED, 0),
+            'revenue': float(revenue) if revenue else 0.0,
         }
         
-        # Add revenue if orders have total field
-        try:
-            from django.db.models import Sum
-            revenue = queryset.filter(
-                status=Order.Status.COMPLETE
-            ).aggregate(total_revenue=Sum('total'))['total_revenue']
-            stats['revenue'] = float(revenue) if revenue else 0.0
-        except:
-            pass
-        
         return Response(stats)
\ No newline at end of file
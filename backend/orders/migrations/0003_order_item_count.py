@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-15 12:05
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def fill_item_count(apps, schema_editor):
+    """Backfill item_count from the quantities of existing order items"""
+    Order = apps.get_model("orders", "Order")
+    OrderItem = apps.get_model("orders", "OrderItem")
+    quantities = (
+        OrderItem.objects.filter(order=OuterRef("pk"))
+        .order_by()
+        .values("order")
+        .annotate(s=Sum("quantity"))
+        .values("s")
+    )
+    Order.objects.update(item_count=Coalesce(Subquery(quantities), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0002_order_status_created_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="order",
+            name="item_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_item_count, migrations.RunPython.noop),
+    ]
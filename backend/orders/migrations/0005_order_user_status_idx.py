@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-15 12:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0004_order_created_desc_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(fields=["user", "status"], name="order_user_status_idx"),
+        ),
+    ]
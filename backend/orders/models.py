@@ -1,12 +1,49 @@
-from decimal import Decimal, ROUND_HALF_UP
+from decimal import Decimal
 from django.db import models
 from django.db.models import Q, F, Sum
+from django.db.models.functions import Coalesce
 from django.conf import settings
 from django.utils import timezone
+from django.utils.functional import cached_property
 from datetime import timedelta
 from django.core.exceptions import ValidationError
 from operations.models import RestaurantSetting
 
+_ZERO = Decimal("0.00")
+
+# Columns written by the state changes and pricing, which skip full_clean()
+_PARTIAL_SAVE_FIELDS = frozenset({
+    "status", "completed_at", "canceled_at", "cancel_reason",
+    "subtotal", "tax_amount", "total", "gratuity",
+})
+
+
+def _to_cents(amount):
+    """Whole cents in a Decimal amount, rounded half up
+
+    Half up to cents only depends on the third decimal, so the amount is
+    truncated to mills and rounded with integer math.
+    """
+    mills = int(amount * 1000)
+    if mills >= 0:
+        return (mills + 5) // 10
+    return -((5 - mills) // 10)
+
+
+def _from_cents(cents):
+    """Two-place Decimal amount from whole cents"""
+    return Decimal(cents).scaleb(-2)
+
+
+def _within_business_hours(rs, creation_time):
+    """Whether a local creation time falls between opening and last call"""
+    return rs.open_time <= creation_time <= rs.last_call and creation_time < rs.close_time
+
+
+def compute_promised_ready_time(created_at, default_ready_minutes):
+    """Return the time an order created at created_at is promised to be ready"""
+    return created_at + timedelta(minutes=default_ready_minutes)
+
 # Create your models here.
 class Order(models.Model):
     class Status(models.TextChoices):
@@ -28,6 +65,9 @@ class Order(models.Model):
     tax_amount = models.DecimalField(max_digits=8, decimal_places=2, default=Decimal("0.00"))
     gratuity = models.DecimalField(max_digits=8, decimal_places=2, default=Decimal("0.00"))
 
+    # Sum of item quantities, kept in step with the order items
+    item_count = models.PositiveIntegerField(default=0, editable=False)
+
     # times
     created_at = models.DateTimeField(default=timezone.now)
     completed_at = models.DateTimeField(null=True, blank=True)
@@ -37,6 +77,16 @@ class Order(models.Model):
     class Meta:
         verbose_name = "Order"
         verbose_name_plural = "Orders"
+        indexes = [
+            # Status counts and date filters for the staff order views
+            models.Index(fields=["status", "created_at"], name="order_status_created_idx"),
+            # Newest-first pages of the staff order list
+            models.Index(fields=["-created_at"], name="order_created_desc_idx"),
+            # Per-customer status counts
+            models.Index(fields=["user", "status"], name="order_user_status_idx"),
+            # A customer's orders, newest first
+            models.Index(fields=["user", "-created_at"], name="order_user_created_idx"),
+        ]
         constraints = [
             # Non negative decimals in tax, gratuity and total
             models.CheckConstraint(
@@ -64,31 +114,46 @@ class Order(models.Model):
             ),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the status as loaded so save() can spot transitions without a query"""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get("status")
+        return instance
+
     def save(self, *args, **kwargs):
         """Override save to ensure the validation runs"""
+        # Stamp the time of the status the order is entering, if it has none yet
         if self.pk:
-            old = type(self).objects.only("status","completed_at","canceled_at").get(pk=self.pk)
-
-            # -> COMPLETE
-            if old.status != self.Status.COMPLETE and self.status == self.Status.COMPLETE and not self.completed_at:
+            if self.status == self.Status.COMPLETE and not self.completed_at:
                 self.completed_at = timezone.now()
-                if self.canceled_at:  # keep your DB constraint happy
-                    self.canceled_at = None
-
-            # -> CANCELED
-            if old.status != self.Status.CANCELED and self.status == self.Status.CANCELED and not self.canceled_at:
+                if self._stored_status() != self.Status.COMPLETE:
+                    self.canceled_at = None  # keep your DB constraint happy
+            elif self.status == self.Status.CANCELED and not self.canceled_at:
                 self.canceled_at = timezone.now()
-                if self.completed_at:
+                if self._stored_status() != self.Status.CANCELED:
                     self.completed_at = None
-            else:
-                now = timezone.now()
-                if self.status == self.Status.COMPLETE and not self.completed_at:
-                    self.completed_at = now
-                if self.status == self.Status.CANCELED and not self.canceled_at:
-                    self.canceled_at = now
-                    
-        self.full_clean()  # This ensures clean() always runs
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and _PARTIAL_SAVE_FIELDS.issuperset(update_fields):
+            # Only validate the touched columns, clean() only applies to new orders
+            self.clean_fields(exclude=[
+                field.name for field in self._meta.concrete_fields if field.name not in update_fields
+            ])
+        else:
+            self.full_clean()  # This ensures clean() always runs
         super().save(*args, **kwargs)
+        # Only a save that wrote the status column makes it the stored one
+        if update_fields is None or "status" in update_fields:
+            self._loaded_status = self.status
+
+    def _stored_status(self):
+        """Status as last loaded or saved, read from the database only if unknown"""
+        old_status = getattr(self, "_loaded_status", None)
+        if old_status is None:
+            # Not loaded from the database (or status deferred)
+            old_status = type(self).objects.values_list("status", flat=True).get(pk=self.pk)
+        return old_status
 
     def __str__(self):
         phone = getattr(self.user, "phone", "")
@@ -97,9 +162,9 @@ class Order(models.Model):
     def clean(self):
         """Validate the order can be created"""
         
-        rs = RestaurantSetting.load()
         # Only validate when new order is created
         if self._state.adding:
+            rs = RestaurantSetting.load()
             creation_time = self.created_at.astimezone(timezone.get_current_timezone()).time()
 
             # Check if the restaurant is accepting orders
@@ -109,57 +174,160 @@ class Order(models.Model):
                 )
             
             # Check if the order creation time is not valid
-            if ((creation_time < rs.open_time) or 
-                (creation_time > rs.last_call) or
-                (creation_time >= rs.close_time)):
+            if not _within_business_hours(rs, creation_time):
                 raise ValidationError(
                     "Only accept orders created within available business hours"
                 )
 
-    @property
+    @classmethod
+    def bulk_create_validated(cls, orders, batch_size=1000):
+        """Create new orders in bulk, checking business hours once for the batch
+
+        Applies the same rules as clean() with a single settings load.
+        Nothing is created if any order falls outside the business hours.
+        """
+        orders = list(orders)
+        rs = RestaurantSetting.load()
+
+        # Check if the restaurant is accepting orders
+        if not rs.is_accepting_orders:
+            raise ValidationError(
+                "Restaurant is not accepting orders."
+            )
+
+        tz = timezone.get_current_timezone()
+        rejected = 0
+        for order in orders:
+            creation_time = order.created_at.astimezone(tz).time()
+            if not _within_business_hours(rs, creation_time):
+                rejected += 1
+
+        if rejected:
+            raise ValidationError(
+                f"Only accept orders created within available business hours "
+                f"({rejected} of {len(orders)} orders rejected)"
+            )
+
+        return cls.objects.bulk_create(orders, batch_size=batch_size)
+
+    @cached_property
     def promised_ready_time(self):
-        """Property that returns the promist ready time for an order"""
+        """Property that returns the promist ready time for an order (computed once per instance)"""
         rs = RestaurantSetting.load()
-        return timezone.localtime(self.created_at) + timedelta(minutes=rs.default_ready_minutes)
-    
-    @property
-    def item_count(self):
-        """Return the sum of the items in the order"""
-        return self.items.aggregate(counts=Sum("quantity"))["counts"] or 0   
+        # Aware datetime; serializers localize it when rendering
+        return compute_promised_ready_time(self.created_at, rs.default_ready_minutes)
     
+    def refresh_item_count(self):
+        """Recount item_count from the order items, repairing any drift"""
+        self.item_count = self.items.aggregate(n=Coalesce(Sum("quantity"), 0))["n"]
+        type(self).objects.filter(pk=self.pk).update(item_count=self.item_count)
+
+    def has_items(self):
+        """Return whether the order has any items, stopping at the first row"""
+        return self.items.exists()
+
+    def items_with_menu(self):
+        """Return the order items with their menu items joined in the same query"""
+        return self.items.select_related("item")
+
     # Change states ========================================================
     def make_order_ready(self):
         """Mark order as ready"""
-        if timezone.localtime(timezone.now()) >= self.promised_ready_time:
-            self.status = self.Status.READY
-            self.save(update_fields=["status"])
+        # Aware datetimes compare correctly across time zones
+        if timezone.now() >= self.promised_ready_time:
+            return self._change_status(self.Status.READY)
+        return False
 
     def complete_order(self):
         """Mark order as completed"""
-        self.completed_at = timezone.now()
-        self.status = self.Status.COMPLETE
-        self.save(update_fields=["status", "completed_at"])
+        return self._change_status(self.Status.COMPLETE, completed_at=timezone.now())
 
     def cancel_order(self, reason):
         """Mark order as canceled"""
-        self.canceled_at = timezone.now()
-        self.status = self.Status.CANCELED
-        self.cancel_reason = reason
-        self.save(update_fields=[ "status", "canceled_at", "cancel_reason"])
+        return self._change_status(self.Status.CANCELED, canceled_at=timezone.now(), cancel_reason=reason)
+
+    def _change_status(self, new_status, **changes):
+        """Write a status change with one conditional UPDATE
+
+        The row is only updated while its stored status may still move to
+        new_status, so a lost race or an invalid transition writes nothing.
+        Returns whether it was updated; the instance mirrors the written values.
+        """
+        # Same field validation save() would do for these columns
+        for name, value in changes.items():
+            try:
+                changes[name] = self._meta.get_field(name).clean(value, self)
+            except ValidationError as e:
+                raise ValidationError({name: e.error_list})
+
+        from_statuses = [
+            status for status, targets in VALID_STATUS_TRANSITIONS.items() if new_status in targets
+        ]
+        updated = type(self).objects.filter(pk=self.pk, status__in=from_statuses).update(
+            status=new_status, **changes
+        )
+        if updated:
+            self.status = self._loaded_status = new_status
+            for name, value in changes.items():
+                setattr(self, name, value)
+        return bool(updated)
 
     # Calculate prices ====================================================
+    def recompute_items(self):
+        """Recompute every item total from its unit price snapshot in one UPDATE"""
+        items = list(self.items.only("id", "quantity", "unit_price", "item_total"))
+        for order_item in items:
+            order_item.calculate_item_total()
+        OrderItem.objects.bulk_update(items, ["item_total"], batch_size=500)
+
     def calculate_prices(self):
         """Return the prices of the order"""
-        decimals = Decimal("0.01")
-        self.subtotal = self.items.aggregate(s=Sum("item_total"))["s"] or Decimal("0.00")
-        self.subtotal = self.subtotal.quantize(decimals, rounding=ROUND_HALF_UP)
+        before = (self.subtotal, self.tax_amount, self.gratuity, self.total)
+
+        # Work in whole cents with the tax rate in basis points (0.07 -> 700)
+        tax_rate_bps = int(Decimal(self.tax_rate).scaleb(4))
+        subtotal_cents = _to_cents(self.items.aggregate(s=Sum("item_total"))["s"] or _ZERO)
+        # Round half up: add half of the divisor before the floor division
+        tax_cents = (subtotal_cents * tax_rate_bps + 5000) // 10000
+        gratuity_cents = _to_cents(self.gratuity or _ZERO)
+
+        self.subtotal = _from_cents(subtotal_cents)
+        self.tax_amount = _from_cents(tax_cents)
+        self.gratuity = _from_cents(gratuity_cents)
+        self.total = _from_cents(subtotal_cents + tax_cents + gratuity_cents)
 
-        self.tax_amount = (self.subtotal * self.tax_rate).quantize(decimals, rounding=ROUND_HALF_UP)
-        self.gratuity = (self.gratuity or Decimal("0.00")).quantize(decimals, rounding=ROUND_HALF_UP)
-        self.total = (self.subtotal + self.tax_amount + self.gratuity).quantize(decimals, rounding=ROUND_HALF_UP)
-        self.save(update_fields=["subtotal", "tax_amount", "total", "gratuity"])
+        # Nothing to write when the amounts did not change
+        if (self.subtotal, self.tax_amount, self.gratuity, self.total) == before:
+            return
+
+        # One UPDATE with the computed amounts; save() would re-run full_clean()
+        type(self).objects.filter(pk=self.pk).update(
+            subtotal=self.subtotal,
+            tax_amount=self.tax_amount,
+            gratuity=self.gratuity,
+            total=self.total,
+        )
+
+
+# The validated transactions
+# Pending => Ready or Cancel
+# Ready => Complete or Cancel
+# Complete => no further status
+# Cancel => no further status
+VALID_STATUS_TRANSITIONS = {
+    Order.Status.PENDING: frozenset((Order.Status.READY, Order.Status.CANCELED)),
+    Order.Status.READY: frozenset((Order.Status.COMPLETE, Order.Status.CANCELED)),
+    Order.Status.COMPLETE: frozenset(),
+    Order.Status.CANCELED: frozenset(),
+}
 
     
+class OrderItemDisplayManager(models.Manager):
+    """Order items with their menu item joined, for rendering __str__ in lists"""
+    def get_queryset(self):
+        return super().get_queryset().select_related("item")
+
+
 class OrderItem(models.Model):
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name="items")
     item = models.ForeignKey("menu.MenuItem", on_delete=models.PROTECT, related_name="order_items")
@@ -170,6 +338,9 @@ class OrderItem(models.Model):
     unit_price = models.DecimalField(max_digits=5, decimal_places=2)
     item_total = models.DecimalField(max_digits=8, decimal_places=2)
 
+    objects = models.Manager()
+    display_objects = OrderItemDisplayManager()
+
     class Meta:
         unique_together = ["order", "item"]
         verbose_name = "Order Item"
@@ -188,7 +359,37 @@ class OrderItem(models.Model):
     def __str__(self):
         return f"{self.quantity} x {self.item.name} @{self.unit_price} = ${self.item_total}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the stored quantity so save() and delete() can adjust Order.item_count"""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_quantity = instance.__dict__.get("quantity")
+        return instance
+
     def save(self, *args, **kwargs):
-        q = Decimal("0.01")
-        self.item_total = (self.unit_price * self.quantity).quantize(q, rounding=ROUND_HALF_UP)
-        super().save(*args, **kwargs)
\ No newline at end of file
+        update_fields = kwargs.get("update_fields")
+        if self._state.adding:
+            delta = self.quantity
+        elif update_fields is not None and "quantity" not in update_fields:
+            delta = 0
+        else:
+            old_quantity = getattr(self, "_loaded_quantity", None)
+            if old_quantity is None:
+                old_quantity = type(self).objects.values_list("quantity", flat=True).get(pk=self.pk)
+            delta = self.quantity - old_quantity
+
+        self.calculate_item_total()
+        super().save(*args, **kwargs)
+        self._loaded_quantity = self.quantity
+        if delta:
+            Order.objects.filter(pk=self.order_id).update(item_count=F("item_count") + delta)
+
+    def delete(self, *args, **kwargs):
+        # Subtract what is stored, in case quantity was changed in memory
+        quantity = getattr(self, "_loaded_quantity", None) or self.quantity
+        Order.objects.filter(pk=self.order_id).update(item_count=F("item_count") - quantity)
+        return super().delete(*args, **kwargs)
+
+    def calculate_item_total(self):
+        """Set the line total from the unit price snapshot"""
+        self.item_total = _from_cents(_to_cents(self.unit_price) * self.quantity)
\ No newline at end of file